@@ -4,18 +4,72 @@ Variable Placement Problem Detector for RP2040/FreeRTOS
 Analyzes ELF files to detect potential memory placement issues
 """
 
+import struct
 import subprocess
 import sys
 import re
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
+from enum import IntEnum
+from functools import cached_property
 from typing import List, Tuple, Optional
 
+try:
+    from elftools.elf.elffile import ELFFile
+except ImportError:
+    ELFFile = None  # fall back to the mmap reader or the toolchain
+
+try:
+    from elf_fastparse import FastElf
+except ImportError:
+    FastElf = None
+
+# ELF32 symbol entry: st_name, st_value, st_size, st_info, st_other, st_shndx
+ELF32_SYM = struct.Struct('<IIIBBH')
+
+STT_NAMES = {0: 'NOTYPE', 1: 'OBJECT', 2: 'FUNC', 3: 'SECTION', 4: 'FILE'}
+
+class Severity(IntEnum):
+    WARNING = 1
+    ERROR = 2
+    CRITICAL = 3
+
+# One structured finding: severity plus a (possibly multi-line) message
+Finding = Tuple[Severity, str]
+
+# Report blocks, substituted and written in one go instead of a print per line
+VARIABLE_INFO_TEMPLATE = """Variable Information:
+  Name:     {name}
+  Address:  0x{address:08x}
+  Size:     {size} bytes
+  Section:  {section}
+  Type:     {type}
+  Region:   {region}
+"""
+
+RECOMMENDATION_TEMPLATE = """
+1. Force RAM placement in your source:
+   __attribute__((section(".data"))) volatile uint32_t {var_name} = 0;
+
+2. Or create a custom section in linker script:
+   .volatile_data : {{
+       . = ALIGN(4);
+       *(.volatile_data)
+   }} > RAM
+   Then: __attribute__((section(".volatile_data"))) volatile uint32_t {var_name};
+
+3. For SMP/multicore safety:
+   volatile uint32_t {var_name} __attribute__((aligned(4)));
+   // Access with atomic operations:
+   uint32_t val = __atomic_load_n(&{var_name}, __ATOMIC_SEQ_CST);
+"""
+
 @dataclass
-class MemoryRegion:
-    name: str
-    start: int
+class Symbol:
+    address: int
     size: int
-    attributes: str
+    type: str
+    section: str = "unknown"
 
 @dataclass
 class Variable:
@@ -26,244 +80,403 @@ class Variable:
     type: str
 
 class MemoryAnalyzer:
-    # RP2040 Memory Map
-    RAM_START = 0x20000000
-    RAM_END = 0x20042000  # 264KB
-    FLASH_START = 0x10000000
-    FLASH_END = 0x10200000  # 2MB
-    
-    # Striped RAM regions (for SMP)
-    STRIPED_RAM_START = 0x20000000
-    STRIPED_RAM_END = 0x20040000
-    
-    # Scratch regions (used by multicore)
-    SCRATCH_X_START = 0x20040000
-    SCRATCH_X_END = 0x20041000
-    SCRATCH_Y_START = 0x20041000
-    SCRATCH_Y_END = 0x20042000
+    # Region attribute flags
+    FLAG_RO = 0x1       # read-only at runtime (XIP flash)
+    FLAG_SCRATCH = 0x2  # per-core scratch RAM with special multicore behavior
+
+    # RP2040 memory map: (start, end, name, flags), sorted by start address
+    # so a single bisect classifies any address
+    REGIONS = (
+        (0x10000000, 0x10200000, 'FLASH', FLAG_RO),            # 2MB XIP
+        (0x20000000, 0x20040000, 'STRIPED_RAM', 0),            # 256KB striped SRAM
+        (0x20040000, 0x20041000, 'SCRATCH_X', FLAG_SCRATCH),   # 4KB core1 scratch
+        (0x20041000, 0x20042000, 'SCRATCH_Y', FLAG_SCRATCH),   # 4KB core0 scratch
+    )
+    _REGION_STARTS = tuple(r[0] for r in REGIONS)
+
+    # FreeRTOS heap markers, matched in one linear pass (heap_1..4 use ucHeap,
+    # application-defined heap_5 regions conventionally use xHeap*)
+    _FREERTOS_HEAP_RE = re.compile(rb'ucHeap|xHeap')
+    _FREERTOS_HEAP_RE_STR = re.compile(r'ucHeap|xHeap')
+
+    # POSIX nm line: 'name type value [size]', values in hex (we never pass
+    # --radix, so no signed-decimal variant is needed)
+    _NM_POSIX_RE = re.compile(r'^(\S+)\s+(\S)\s+([0-9a-fA-F]+)(?:\s+([0-9a-fA-F]+))?\s*$')
     
     def __init__(self, elf_file: str):
         self.elf_file = elf_file
-        self.problems = []
-        self.warnings = []
-        
-    def run_command(self, cmd: List[str]) -> str:
-        """Run command and return output"""
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            raise Exception(f"Command failed: {' '.join(cmd)}\n{result.stderr}")
-        return result.stdout
-    
-    def get_variable_info(self, var_name: str) -> Optional[Variable]:
-        """Extract variable information from ELF"""
-        # Get symbol info
-        nm_output = self.run_command(['arm-none-eabi-nm', '-S', self.elf_file])
+        self._variable_cache = {}
         
-        for line in nm_output.splitlines():
+    def _iter_toolchain(self, cmd: List[str]):
+        """Stream command output one line at a time (bounded memory on big ELFs)"""
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True, bufsize=1 << 20)
+        try:
+            yield from proc.stdout
+        finally:
+            proc.stdout.close()
+            if proc.wait() != 0:
+                raise Exception(f"Command failed: {' '.join(cmd)}")
+
+    @cached_property
+    def symbols(self) -> dict:
+        """Toolchain fallback: symbol table keyed by name"""
+        return self._parse_nm()
+
+    @cached_property
+    def sections(self) -> dict:
+        """Toolchain fallback: symbol name -> section map from objdump -t
+
+        Keyed on the exact symbol name so a lookup can never match a longer
+        symbol that merely contains the queried name as a substring."""
+        sections = {}
+        for line in self._iter_toolchain(['arm-none-eabi-objdump', '-t', self.elf_file]):
             parts = line.split()
-            if len(parts) >= 3 and parts[-1] == var_name:
-                addr = int(parts[0], 16)
-                size = int(parts[1], 16) if len(parts) > 3 else 4
-                var_type = parts[-2]
-                
-                # Get section info
-                objdump = self.run_command(['arm-none-eabi-objdump', '-t', self.elf_file])
-                section = "unknown"
-                for obj_line in objdump.splitlines():
-                    if var_name in obj_line:
-                        obj_parts = obj_line.split()
-                        if len(obj_parts) > 3:
-                            section = obj_parts[3]
-                            break
-                
-                return Variable(var_name, addr, size, section, var_type)
-        
+            # Symbol lines always end with 'section size name'; the number of
+            # flag columns before that varies, so index from the end. Hidden
+            # libgcc symbols carry a visibility marker before the name
+            if len(parts) >= 6 and parts[-2] in ('.hidden', '.protected', '.internal'):
+                del parts[-2]
+            if len(parts) >= 5:
+                sections[parts[-1]] = parts[-3]
+        return sections
+
+    @cached_property
+    def _elf_tables(self) -> Optional[Tuple[bytes, dict, list]]:
+        """In-process ELF tables: (strtab bytes, name offset -> raw symbol,
+        section names), or None when only the toolchain fallback is usable.
+
+        Symbol names stay as raw bytes inside strtab; only names that are
+        actually looked up get decoded (most symbols never are). Prefers
+        pyelftools, then the dependency-free mmap reader in elf_fastparse."""
+        if ELFFile is not None:
+            tables = self._parse_with_pyelftools()
+            if tables is not None:
+                return tables
+        if FastElf is not None:
+            try:
+                fast = FastElf(self.elf_file)
+            except (OSError, ValueError, struct.error):
+                return None
+            return fast.strtab, fast.symbols, fast.section_names
         return None
-    
-    def check_volatile_placement(self, var: Variable) -> List[str]:
+
+    def _parse_with_pyelftools(self) -> Optional[Tuple[bytes, dict, list]]:
+        """Read (strtab, symbols, section names) via pyelftools"""
+        with open(self.elf_file, 'rb') as f:
+            elf = ELFFile(f)
+            if elf.elfclass != 32 or elf.little_endian is False:
+                return None  # RP2040 firmware is always ELF32 LE
+            symtab = elf.get_section_by_name('.symtab')
+            if symtab is None:
+                return None
+            strtab = elf.get_section(symtab['sh_link']).data()
+            section_names = [s.name for s in elf.iter_sections()]
+
+            syms = {}
+            for st_name, st_value, st_size, st_info, _, st_shndx in \
+                    ELF32_SYM.iter_unpack(symtab.data()):
+                if st_name != 0:
+                    syms[st_name] = (st_value, st_size, st_info & 0xF, st_shndx)
+        return strtab, syms, section_names
+
+    def _raw_to_symbol(self, raw: Tuple[int, int, int, int]) -> Symbol:
+        """Materialize a Symbol from a raw ELF32 symbol entry"""
+        st_value, st_size, st_type, st_shndx = raw
+        section_names = self._elf_tables[2]
+        section = section_names[st_shndx] if st_shndx < len(section_names) else "unknown"
+        return Symbol(st_value, st_size or 4,
+                      STT_NAMES.get(st_type, str(st_type)), section)
+
+    def _find_symbol(self, name: str) -> Optional[Symbol]:
+        """Look up one symbol by name, decoding as little of strtab as possible"""
+        if self._elf_tables is None:
+            sym = self.symbols.get(name)
+            if sym is not None:
+                sym.section = self.sections.get(name, "unknown")
+            return sym
+
+        strtab, syms, _ = self._elf_tables
+        probe = name.encode()
+
+        # Fast path: the name is stored as a whole NUL-terminated string
+        pos = strtab.find(b'\0' + probe + b'\0')
+        if pos >= 0 and (pos + 1) in syms:
+            return self._raw_to_symbol(syms[pos + 1])
+
+        # Slow path: the linker may share string suffixes between symbols
+        probe += b'\0'
+        for name_off, raw in syms.items():
+            if strtab.startswith(probe, name_off):
+                return self._raw_to_symbol(raw)
+        return None
+
+    def _parse_nm(self) -> dict:
+        """Parse POSIX-format nm output into a name -> Symbol dict in one streamed pass"""
+        symbols = {}
+        # POSIX format is always 'name type value [size]' and --defined-only
+        # drops the variable-column undefined/external lines up front
+        cmd = ['arm-none-eabi-nm', '--defined-only', '--print-size',
+               '--format=posix', self.elf_file]
+        parse_hex = int  # local binding keeps the hot loop free of global lookups
+        match_line = self._NM_POSIX_RE.match
+        for line in self._iter_toolchain(cmd):
+            m = match_line(line)
+            if m is None:
+                continue
+            size = parse_hex(m[4], 16) if m[4] else 4
+            symbols[m[1]] = Symbol(parse_hex(m[3], 16), size, m[2])
+        return symbols
+
+    def _symbol_address(self, *names: str) -> Optional[int]:
+        """Return the address of the first symbol name that exists"""
+        for name in names:
+            sym = self._find_symbol(name)
+            if sym is not None:
+                return sym.address
+        return None
+
+    def _iter_heap_symbols(self):
+        """Yield symbols whose names contain a FreeRTOS heap marker"""
+        if self._elf_tables is None:
+            search = self._FREERTOS_HEAP_RE_STR.search
+            for name, sym in self.symbols.items():
+                if search(name):
+                    yield sym
+            return
+
+        strtab, syms, _ = self._elf_tables
+        seen = set()
+        for match in self._FREERTOS_HEAP_RE.finditer(strtab):
+            # A matching symbol name may start anywhere between the enclosing
+            # string's start and the match itself: the linker shares string
+            # suffixes, so several name offsets can point into one string
+            start = strtab.rfind(b'\0', 0, match.start()) + 1
+            for name_off in range(start, match.start() + 1):
+                if name_off in syms and name_off not in seen:
+                    seen.add(name_off)
+                    yield self._raw_to_symbol(syms[name_off])
+
+    @cached_property
+    def _symbols_by_address(self) -> Tuple[List[int], List[Symbol]]:
+        """Symbols sorted by address, for O(log n) containment lookups"""
+        if self._elf_tables is None:
+            syms = list(self.symbols.values())
+        else:
+            _, raw_syms, _ = self._elf_tables
+            syms = [self._raw_to_symbol(raw) for raw in raw_syms.values()]
+        syms.sort(key=lambda s: s.address)
+        return [s.address for s in syms], syms
+
+    def _containing_symbol(self, address: int) -> Optional[Symbol]:
+        """Return the symbol whose extent contains address, via binary search.
+
+        Symbols starting at the address itself (the queried variable and any
+        equal-address aliases) are skipped, so only a genuinely enclosing
+        extent is reported."""
+        addrs, syms = self._symbols_by_address
+        i = bisect_left(addrs, address) - 1
+        if i >= 0 and syms[i].address + syms[i].size > address:
+            return syms[i]
+        return None
+
+    def get_variable_info(self, var_name: str) -> Optional[Variable]:
+        """Extract variable information from ELF (memoized per variable)"""
+        if var_name not in self._variable_cache:
+            sym = self._find_symbol(var_name)
+            self._variable_cache[var_name] = None if sym is None else \
+                Variable(var_name, sym.address, sym.size, sym.section, sym.type)
+        return self._variable_cache[var_name]
+
+    @classmethod
+    def classify_address(cls, address: int) -> Tuple[str, int]:
+        """Classify an address into (region name, flags) with one bisect"""
+        i = bisect_right(cls._REGION_STARTS, address) - 1
+        if i >= 0 and address < cls.REGIONS[i][1]:
+            return cls.REGIONS[i][2], cls.REGIONS[i][3]
+        return 'UNKNOWN', 0
+
+    def check_volatile_placement(self, var: Variable) -> List[Finding]:
         """Check if volatile variable is properly placed"""
-        problems = []
-        
+        findings = []
+        _, flags = self.classify_address(var.address)
+
         # Check 1: Volatile in Flash
-        if self.FLASH_START <= var.address < self.FLASH_END:
-            problems.append(f"CRITICAL: Volatile variable '{var.name}' placed in FLASH (0x{var.address:08x})")
-            problems.append("  → Flash is read-only at runtime, volatile won't work!")
-            problems.append("  → Solution: Force placement in RAM section")
-        
+        if flags & self.FLAG_RO:
+            findings.append((Severity.CRITICAL,
+                             f"CRITICAL: Volatile variable '{var.name}' placed in FLASH (0x{var.address:08x})\n"
+                             "  → Flash is read-only at runtime, volatile won't work!\n"
+                             "  → Solution: Force placement in RAM section"))
+
         # Check 2: Alignment for atomic operations
         if var.address % 4 != 0:
-            problems.append(f"ERROR: Variable '{var.name}' not 4-byte aligned (0x{var.address:08x})")
-            problems.append("  → Required for atomic operations in SMP")
-            problems.append("  → Solution: Add __attribute__((aligned(4)))")
-        
+            findings.append((Severity.ERROR,
+                             f"ERROR: Variable '{var.name}' not 4-byte aligned (0x{var.address:08x})\n"
+                             "  → Required for atomic operations in SMP\n"
+                             "  → Solution: Add __attribute__((aligned(4)))"))
+
         # Check 3: In scratch regions (bad for SMP)
-        if self.SCRATCH_X_START <= var.address < self.SCRATCH_Y_END:
-            problems.append(f"WARNING: Variable '{var.name}' in scratch RAM (0x{var.address:08x})")
-            problems.append("  → Scratch regions have special multicore behavior")
-            problems.append("  → May cause cache coherency issues")
-        
-        return problems
+        if flags & self.FLAG_SCRATCH:
+            findings.append((Severity.WARNING,
+                             f"WARNING: Variable '{var.name}' in scratch RAM (0x{var.address:08x})\n"
+                             "  → Scratch regions have special multicore behavior\n"
+                             "  → May cause cache coherency issues"))
+
+        return findings
     
-    def check_memory_conflicts(self, var: Variable) -> List[str]:
+    def check_memory_conflicts(self, var: Variable) -> List[Finding]:
         """Check for conflicts with heap/stack"""
-        problems = []
-        
+        findings = []
+
         # Get heap and stack boundaries
-        symbols = self.run_command(['arm-none-eabi-nm', self.elf_file])
-        
-        heap_start = heap_end = stack_start = stack_end = None
-        
-        for line in symbols.splitlines():
-            parts = line.split()
-            if len(parts) >= 3:
-                if parts[2] == '_heap_start':
-                    heap_start = int(parts[0], 16)
-                elif parts[2] == '_heap_end' or parts[2] == '__HeapLimit':
-                    heap_end = int(parts[0], 16)
-                elif parts[2] == '__StackTop' or parts[2] == '_stack_top':
-                    stack_end = int(parts[0], 16)
-                elif parts[2] == '__StackLimit' or parts[2] == '_stack_bottom':
-                    stack_start = int(parts[0], 16)
-        
+        heap_start = self._symbol_address('_heap_start')
+        heap_end = self._symbol_address('_heap_end', '__HeapLimit')
+        stack_end = self._symbol_address('__StackTop', '_stack_top')
+        stack_start = self._symbol_address('__StackLimit', '_stack_bottom')
+
         # Check heap collision
         if heap_start and heap_end:
             if heap_start <= var.address < heap_end:
-                problems.append(f"CRITICAL: Variable '{var.name}' overlaps with heap!")
-                problems.append(f"  → Variable at 0x{var.address:08x}, heap: 0x{heap_start:08x}-0x{heap_end:08x}")
+                findings.append((Severity.CRITICAL,
+                                 f"CRITICAL: Variable '{var.name}' overlaps with heap!\n"
+                                 f"  → Variable at 0x{var.address:08x}, heap: 0x{heap_start:08x}-0x{heap_end:08x}"))
             elif abs(var.address - heap_start) < 256:
-                problems.append(f"WARNING: Variable '{var.name}' very close to heap (distance: {abs(var.address - heap_start)} bytes)")
-        
+                findings.append((Severity.WARNING,
+                                 f"WARNING: Variable '{var.name}' very close to heap (distance: {abs(var.address - heap_start)} bytes)"))
+
         # Check stack collision
         if stack_start and stack_end:
             if stack_start <= var.address < stack_end:
-                problems.append(f"CRITICAL: Variable '{var.name}' overlaps with stack!")
+                findings.append((Severity.CRITICAL,
+                                 f"CRITICAL: Variable '{var.name}' overlaps with stack!"))
             elif abs(var.address - stack_start) < 1024:
-                problems.append(f"WARNING: Variable '{var.name}' close to stack (distance: {abs(var.address - stack_start)} bytes)")
-        
-        return problems
+                findings.append((Severity.WARNING,
+                                 f"WARNING: Variable '{var.name}' close to stack (distance: {abs(var.address - stack_start)} bytes)"))
+
+        # Check overlap with any other allocated symbol (single bisect)
+        containing = self._containing_symbol(var.address)
+        if containing is not None:
+            findings.append((Severity.WARNING,
+                             f"WARNING: Variable '{var.name}' lies inside another symbol's extent\n"
+                             f"  → Containing symbol at 0x{containing.address:08x}, "
+                             f"{containing.size} bytes, section {containing.section}"))
+
+        return findings
     
-    def check_freertos_specific(self, var: Variable) -> List[str]:
+    def check_freertos_specific(self, var: Variable) -> List[Finding]:
         """Check FreeRTOS-specific issues"""
-        problems = []
-        
+        findings = []
+
         # Check if in FreeRTOS heap region
-        symbols = self.run_command(['arm-none-eabi-nm', self.elf_file])
-        
-        for line in symbols.splitlines():
-            parts = line.split()
-            if len(parts) >= 3 and ('ucHeap' in parts[2] or 'xHeap' in parts[2]):
-                freertos_heap_addr = int(parts[0], 16)
-                # Assume default configTOTAL_HEAP_SIZE
-                if freertos_heap_addr <= var.address < freertos_heap_addr + 0x10000:
-                    problems.append(f"ERROR: Variable '{var.name}' inside FreeRTOS heap!")
-                    problems.append("  → Will be overwritten by dynamic allocation")
-        
+        for sym in self._iter_heap_symbols():
+            freertos_heap_addr = sym.address
+            # Assume default configTOTAL_HEAP_SIZE
+            if freertos_heap_addr <= var.address < freertos_heap_addr + 0x10000:
+                findings.append((Severity.ERROR,
+                                 f"ERROR: Variable '{var.name}' inside FreeRTOS heap!\n"
+                                 "  → Will be overwritten by dynamic allocation"))
+
         # Check section attributes
         if var.section == '.bss' and 'volatile' in var.name.lower():
-            problems.append(f"WARNING: Volatile variable '{var.name}' in .bss section")
-            problems.append("  → May not be initialized before FreeRTOS starts")
-            problems.append("  → Solution: Place in .data with explicit init value")
-        
-        return problems
-    
-    def analyze_variable(self, var_name: str) -> Tuple[List[str], List[str]]:
-        """Analyze a specific variable for problems"""
-        var = self.get_variable_info(var_name)
-        if not var:
-            return [f"Variable '{var_name}' not found in ELF"], []
-        
-        all_problems = []
-        all_warnings = []
-        
-        # Run all checks
-        problems = self.check_volatile_placement(var)
-        all_problems.extend([p for p in problems if 'CRITICAL' in p or 'ERROR' in p])
-        all_warnings.extend([p for p in problems if 'WARNING' in p])
-        
-        problems = self.check_memory_conflicts(var)
-        all_problems.extend([p for p in problems if 'CRITICAL' in p or 'ERROR' in p])
-        all_warnings.extend([p for p in problems if 'WARNING' in p])
-        
-        problems = self.check_freertos_specific(var)
-        all_problems.extend([p for p in problems if 'CRITICAL' in p or 'ERROR' in p])
-        all_warnings.extend([p for p in problems if 'WARNING' in p])
-        
-        return all_problems, all_warnings
-    
+            findings.append((Severity.WARNING,
+                             f"WARNING: Volatile variable '{var.name}' in .bss section\n"
+                             "  → May not be initialized before FreeRTOS starts\n"
+                             "  → Solution: Place in .data with explicit init value"))
+
+        return findings
+
+    def analyze_variable(self, var: Variable) -> Tuple[List[str], List[str]]:
+        """Analyze an already-resolved variable for problems"""
+        findings = []
+        findings.extend(self.check_volatile_placement(var))
+        findings.extend(self.check_memory_conflicts(var))
+        findings.extend(self.check_freertos_specific(var))
+
+        # Integer compares on the severity tag, no substring scans
+        problems = [msg for sev, msg in findings if sev >= Severity.ERROR]
+        warnings = [msg for sev, msg in findings if sev == Severity.WARNING]
+        return problems, warnings
+
+    def analyze_variables(self, names: List[str]) -> dict:
+        """Analyze several variables against one parsed ELF.
+
+        Returns name -> (problems, warnings); the ELF is parsed once and
+        every additional variable costs only dict lookups."""
+        results = {}
+        for name in names:
+            var = self.get_variable_info(name)
+            if var is None:
+                results[name] = ([f"Variable '{name}' not found in ELF"], [])
+            else:
+                results[name] = self.analyze_variable(var)
+        return results
+
     def generate_report(self, var_name: str):
         """Generate full analysis report"""
-        print(f"\n{'='*60}")
-        print(f"Memory Placement Analysis: {var_name}")
-        print(f"{'='*60}\n")
-        
+        out = [f"\n{'='*60}\nMemory Placement Analysis: {var_name}\n{'='*60}\n\n"]
+
         var = self.get_variable_info(var_name)
         if not var:
-            print(f"ERROR: Variable '{var_name}' not found!")
+            out.append(f"ERROR: Variable '{var_name}' not found!\n")
+            sys.stdout.write(''.join(out))
             return
-        
-        # Basic info
-        print(f"Variable Information:")
-        print(f"  Name:     {var.name}")
-        print(f"  Address:  0x{var.address:08x}")
-        print(f"  Size:     {var.size} bytes")
-        print(f"  Section:  {var.section}")
-        print(f"  Type:     {var.type}")
-        
+
         # Memory region
-        if self.RAM_START <= var.address < self.RAM_END:
-            print(f"  Region:   RAM (OK for volatile)")
-        elif self.FLASH_START <= var.address < self.FLASH_END:
-            print(f"  Region:   FLASH (PROBLEM for volatile!)")
+        region, flags = self.classify_address(var.address)
+        if flags & self.FLAG_RO:
+            region_text = f"{region} (PROBLEM for volatile!)"
+        elif region != 'UNKNOWN':
+            region_text = f"{region} (OK for volatile)"
         else:
-            print(f"  Region:   Unknown")
-        
-        # Run analysis
-        problems, warnings = self.analyze_variable(var_name)
-        
+            region_text = "Unknown"
+
+        # Basic info
+        out.append(VARIABLE_INFO_TEMPLATE.format(
+            name=var.name, address=var.address, size=var.size,
+            section=var.section, type=var.type, region=region_text))
+
+        # Run analysis on the variable resolved above
+        problems, warnings = self.analyze_variable(var)
+
         if problems:
-            print(f"\n❌ PROBLEMS FOUND ({len(problems)}):")
-            for p in problems:
-                print(f"  {p}")
-        
+            out.append(f"\n❌ PROBLEMS FOUND ({len(problems)}):\n")
+            out.extend(f"  {p}\n" for p in problems)
+
         if warnings:
-            print(f"\n⚠️  WARNINGS ({len(warnings)}):")
-            for w in warnings:
-                print(f"  {w}")
-        
+            out.append(f"\n⚠️  WARNINGS ({len(warnings)}):\n")
+            out.extend(f"  {w}\n" for w in warnings)
+
         if not problems and not warnings:
-            print("\n✅ No problems detected!")
-        
+            out.append("\n✅ No problems detected!\n")
+
         # Recommendations
-        print(f"\n{'='*60}")
-        print("RECOMMENDATIONS:")
-        print(f"{'='*60}")
-        
+        out.append(f"\n{'='*60}\nRECOMMENDATIONS:\n{'='*60}\n")
         if problems or warnings:
-            print("\n1. Force RAM placement in your source:")
-            print(f"   __attribute__((section(\".data\"))) volatile uint32_t {var_name} = 0;")
-            
-            print("\n2. Or create a custom section in linker script:")
-            print("   .volatile_data : {")
-            print("       . = ALIGN(4);")
-            print("       *(.volatile_data)")
-            print("   } > RAM")
-            print(f"   Then: __attribute__((section(\".volatile_data\"))) volatile uint32_t {var_name};")
-            
-            print("\n3. For SMP/multicore safety:")
-            print(f"   volatile uint32_t {var_name} __attribute__((aligned(4)));")
-            print("   // Access with atomic operations:")
-            print(f"   uint32_t val = __atomic_load_n(&{var_name}, __ATOMIC_SEQ_CST);")
+            out.append(RECOMMENDATION_TEMPLATE.format(var_name=var_name))
+
+        sys.stdout.write(''.join(out))
+
+def parse_variable_names(args: List[str]) -> Optional[List[str]]:
+    """Resolve the variable-name arguments into a list of names"""
+    if len(args) == 2 and args[0] == '--vars':
+        return [name for name in args[1].split(',') if name]
+    if len(args) == 1:
+        if args[0].startswith('@'):
+            with open(args[0][1:]) as f:
+                return [line.strip() for line in f if line.strip()]
+        return [args[0]]
+    return None
 
 def main():
-    if len(sys.argv) != 3:
+    names = parse_variable_names(sys.argv[2:]) if len(sys.argv) >= 3 else None
+    if not names:
         print("Usage: python3 check_placement.py <elf_file> <variable_name>")
+        print("       python3 check_placement.py <elf_file> --vars <v1,v2,...>")
+        print("       python3 check_placement.py <elf_file> @<names_file>")
         sys.exit(1)
-    
-    elf_file = sys.argv[1]
-    var_name = sys.argv[2]
-    
-    analyzer = MemoryAnalyzer(elf_file)
-    analyzer.generate_report(var_name)
+
+    analyzer = MemoryAnalyzer(sys.argv[1])
+    for name in names:
+        analyzer.generate_report(name)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
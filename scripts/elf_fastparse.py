@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Minimal ELF32 little-endian symbol table reader for RP2040 firmware
+Dependency-free mmap + struct alternative to pyelftools
+"""
+
+import mmap
+import os
+import struct
+
+ELF_MAGIC = b'\x7fELF'
+ELFCLASS32 = 1
+ELFDATA2LSB = 1
+SHT_SYMTAB = 2
+
+# Elf32_Ehdr: ident, type, machine, version, entry, phoff, shoff, flags,
+#             ehsize, phentsize, phnum, shentsize, shnum, shstrndx
+EHDR = struct.Struct('<16sHHIIIIIHHHHHH')
+# Elf32_Shdr: name, type, flags, addr, offset, size, link, info, addralign, entsize
+SHDR = struct.Struct('<IIIIIIIIII')
+# Elf32_Sym: name, value, size, info, other, shndx
+SYM = struct.Struct('<IIIBBH')
+
+
+class FastElf:
+    """Parse .symtab/.strtab/section names straight from an mmap'd ELF32 image.
+
+    Exposes:
+      symbols       -- strtab name offset -> (value, size, type, shndx)
+      strtab        -- raw .strtab bytes (names are resolved lazily by callers)
+      section_names -- section index -> decoded section name
+    """
+
+    def __init__(self, path: str):
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+
+        try:
+            fields = EHDR.unpack_from(mm, 0)
+            ident, shoff, shentsize, shnum, shstrndx = \
+                fields[0], fields[6], fields[11], fields[12], fields[13]
+            if (ident[:4] != ELF_MAGIC or ident[4] != ELFCLASS32
+                    or ident[5] != ELFDATA2LSB):
+                raise ValueError(f"{path}: not an ELF32 little-endian file")
+
+            shdrs = [SHDR.unpack_from(mm, shoff + i * shentsize)
+                     for i in range(shnum)]
+
+            shstr = self._section_bytes(mm, shdrs[shstrndx])
+            self.section_names = [self._string_at(shstr, sh[0]) for sh in shdrs]
+
+            self.strtab = b''
+            self.symbols = {}
+            for sh in shdrs:
+                if sh[1] == SHT_SYMTAB:
+                    self.strtab = self._section_bytes(mm, shdrs[sh[6]])
+                    for st_name, st_value, st_size, st_info, _, st_shndx in \
+                            SYM.iter_unpack(self._section_bytes(mm, sh)):
+                        if st_name != 0:
+                            self.symbols[st_name] = \
+                                (st_value, st_size, st_info & 0xF, st_shndx)
+                    break
+        finally:
+            mm.close()
+
+    @staticmethod
+    def _section_bytes(mm: mmap.mmap, shdr: tuple) -> bytes:
+        """Return the raw contents of a section (offset/size from its header)"""
+        return mm[shdr[4]:shdr[4] + shdr[5]]
+
+    @staticmethod
+    def _string_at(table: bytes, offset: int) -> str:
+        """Decode one NUL-terminated string from a string table"""
+        end = table.find(b'\0', offset)
+        return table[offset:end if end >= 0 else None].decode('utf-8', 'replace')